@@ -0,0 +1,228 @@
+import argparse
+import csv
+import time
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+
+from sampler import DDIMSampler, upsample_bicubic
+from schedule import NoiseSchedule
+from unet import build_sr3_model, load_model_config
+
+TABLE_HEADER = f"{'steps':>6} {'run':>5} {'PSNR (dB)':>10} {'images/s':>12} {'seconds':>10}"
+CSV_FIELDS = ['steps', 'actual_steps', 'psnr', 'images_per_second', 'seconds']
+
+
+def load_benchmark_images(data_dir, num_images, image_size, seed=42):
+    """
+    Load center crops of local images, or synthetic smooth images when no
+    folder is given, as the high resolution references.
+    """
+    if data_dir is None:
+        rng = np.random.default_rng(seed)
+        coarse = rng.uniform(0.0, 1.0, size=(num_images, 8, 8, 3)).astype(np.float32)
+        return tf.image.resize(coarse, (image_size, image_size), method='bicubic').numpy().clip(0.0, 1.0)
+
+    folder_path = Path(data_dir)
+    image_paths = sorted(list(folder_path.glob('*.png')) + list(folder_path.glob('*.jpg')) + list(folder_path.glob('*.jpeg')))
+    if not image_paths:
+        raise ValueError(f"No images found in {folder_path}")
+
+    images = []
+    for path in image_paths[:num_images]:
+        img = tf.image.decode_image(tf.io.read_file(str(path)), channels=3, expand_animations=False)
+        img = tf.image.convert_image_dtype(img, tf.float32)
+        img = tf.image.resize_with_crop_or_pad(img, image_size, image_size)
+        images.append(img.numpy())
+    return np.stack(images)
+
+
+def load_full_images(data_dir, num_images, scale, seed=42):
+    """
+    Load full size local images, or synthetic images of uneven sizes when no
+    folder is given, cropped so both sides are multiples of scale.
+    """
+    if data_dir is None:
+        rng = np.random.default_rng(seed)
+        sizes = [(180, 248), (96, 132), (52, 40)]
+        images = []
+        for i in range(num_images):
+            height, width = sizes[i % len(sizes)]
+            coarse = rng.uniform(0.0, 1.0, size=(height // 8, width // 8, 3)).astype(np.float32)
+            images.append(tf.image.resize(coarse, (height, width), method='bicubic').numpy().clip(0.0, 1.0))
+    else:
+        folder_path = Path(data_dir)
+        image_paths = sorted(list(folder_path.glob('*.png')) + list(folder_path.glob('*.jpg')) + list(folder_path.glob('*.jpeg')))
+        if not image_paths:
+            raise ValueError(f"No images found in {folder_path}")
+        images = []
+        for path in image_paths[:num_images]:
+            img = tf.image.decode_image(tf.io.read_file(str(path)), channels=3, expand_animations=False)
+            images.append(tf.image.convert_image_dtype(img, tf.float32).numpy())
+
+    return [img[:img.shape[0] - img.shape[0] % scale, :img.shape[1] - img.shape[1] % scale] for img in images]
+
+
+def degrade(hr_images, scale):
+    """
+    Build the bicubic upsampled low resolution conditioning images.
+    """
+    height, width = hr_images.shape[1:3]
+    lr = tf.image.resize(hr_images, (height // scale, width // scale), method='bicubic', antialias=True)
+    lr_upsampled = tf.image.resize(lr, (height, width), method='bicubic')
+    return tf.clip_by_value(lr_upsampled, 0.0, 1.0).numpy()
+
+
+def _record(sampler, n_steps, eta, spacing, psnr, num_images, elapsed):
+    """
+    Build one result row. 'quad' spacing merges duplicate timesteps, so the
+    number of steps actually run can be lower than the requested one.
+    """
+    actual_steps = len(sampler.schedule.ddim_coefficients(n_steps, eta, spacing)['timesteps'])
+    print(f"{n_steps:>6} {actual_steps:>5} {psnr:>10.2f} {num_images / elapsed:>12.3f} {elapsed:>10.2f}")
+    return {
+        'steps': n_steps,
+        'actual_steps': actual_steps,
+        'psnr': float(psnr),
+        'images_per_second': num_images / elapsed,
+        'seconds': elapsed,
+    }
+
+
+def benchmark(sampler, hr_images, conditions, steps_list, eta=0.0, spacing='uniform', batch_size=8):
+    """
+    Measure PSNR and throughput of the sampler for each number of steps.
+    """
+    # Trace the compiled sampling loop once so it is not included in the timings
+    sampler.sample(conditions[:batch_size], n_steps=1, eta=eta, spacing=spacing, batch_size=batch_size)
+
+    results = []
+    for n_steps in steps_list:
+        start = time.perf_counter()
+        sr_images = sampler.sample(conditions, n_steps=n_steps, eta=eta, spacing=spacing, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+
+        psnr = tf.reduce_mean(tf.image.psnr(hr_images, sr_images, max_val=1.0)).numpy()
+        results.append(_record(sampler, n_steps, eta, spacing, psnr, len(conditions), elapsed))
+
+    return results
+
+
+def benchmark_tiled(sampler, hr_images, steps_list, scale=4, tile_size=64, overlap=8,
+                    eta=0.0, spacing='uniform', batch_size=8):
+    """
+    Measure PSNR and throughput of super_resolve on full size images, including
+    tiling, batching of the tiles of all images and blending.
+    """
+    lr_images = [
+        tf.clip_by_value(tf.image.resize(hr, (hr.shape[0] // scale, hr.shape[1] // scale),
+                                         method='bicubic', antialias=True), 0.0, 1.0).numpy()
+        for hr in hr_images
+    ]
+    bicubic_psnr = np.mean([
+        tf.image.psnr(hr, upsample_bicubic(lr, scale), max_val=1.0).numpy() for hr, lr in zip(hr_images, lr_images)
+    ])
+    megapixels = sum(hr.shape[0] * hr.shape[1] for hr in hr_images) / 1e6
+    print(f"Bicubic PSNR: {bicubic_psnr:.2f} dB ({len(hr_images)} images, {megapixels:.2f} MP, tiles {tile_size}px)")
+    print(TABLE_HEADER)
+
+    sample_kwargs = {'eta': eta, 'spacing': spacing, 'batch_size': batch_size}
+    # Trace the compiled sampling loop once so it is not included in the timings
+    sampler.super_resolve(lr_images[:1], scale, tile_size, overlap, n_steps=1, **sample_kwargs)
+
+    results = []
+    for n_steps in steps_list:
+        start = time.perf_counter()
+        sr_images = sampler.super_resolve(lr_images, scale, tile_size, overlap, n_steps=n_steps, **sample_kwargs)
+        elapsed = time.perf_counter() - start
+
+        psnr = np.mean([tf.image.psnr(hr, sr, max_val=1.0).numpy() for hr, sr in zip(hr_images, sr_images)])
+        results.append(_record(sampler, n_steps, eta, spacing, psnr, len(hr_images), elapsed))
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark do amostrador SR3: passos x PSNR x imagens/s na CPU')
+    parser.add_argument('--data-dir', default=None,
+                      help='Pasta com imagens de teste (ex.: images/test). Sem ela usa imagens sintéticas')
+    parser.add_argument('--weights', default=None, help='Pesos treinados com train_sr3.py')
+    parser.add_argument('--steps', default=None,
+                      help='Números de passos a comparar (padrão: T,250,100,50,20,10,5, com T de --timesteps)')
+    parser.add_argument('--eta', type=float, default=0.0, help='0 para DDIM determinístico, 1 para DDPM')
+    parser.add_argument('--spacing', default='uniform', choices=['uniform', 'quad'])
+    parser.add_argument('--scale', type=int, default=4)
+    parser.add_argument('--image-size', type=int, default=64)
+    parser.add_argument('--num-images', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--tiled', action='store_true',
+                      help='Mede super_resolve em imagens inteiras, divididas em tiles, em vez de recortes fixos')
+    parser.add_argument('--tile-size', type=int, default=64, help='Tamanho dos tiles com --tiled')
+    parser.add_argument('--overlap', type=int, default=8, help='Sobreposição entre tiles com --tiled')
+    # Architecture flags default to the configuration saved next to --weights by
+    # train_sr3.py, then to the same defaults as train_sr3.py
+    parser.add_argument('--timesteps', type=int, default=None)
+    parser.add_argument('--base-channels', type=int, default=None)
+    parser.add_argument('--channel-mults', default=None)
+    parser.add_argument('--csv', default=None, help='Arquivo CSV para salvar os resultados')
+    parser.add_argument('--cpu', action='store_true', help='Esconde as GPUs e roda apenas na CPU')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.cpu:
+        tf.config.set_visible_devices([], 'GPU')
+
+    config = {'base_channels': 64, 'channel_mults': [1, 2, 4, 8], 'timesteps': 1000}
+    if args.weights:
+        config.update(load_model_config(args.weights))
+    if args.base_channels is not None:
+        config['base_channels'] = args.base_channels
+    if args.channel_mults is not None:
+        config['channel_mults'] = [int(m) for m in args.channel_mults.split(',')]
+    if args.timesteps is not None:
+        config['timesteps'] = args.timesteps
+
+    model = build_sr3_model(
+        image_size=args.image_size,
+        base_channels=config['base_channels'],
+        channel_mults=tuple(config['channel_mults']),
+    )
+    if args.weights:
+        model.load_weights(args.weights)
+    else:
+        print("Aviso: sem --weights o modelo não está treinado; o PSNR mede apenas o custo do amostrador")
+
+    schedule = NoiseSchedule.from_config('linear', config['timesteps'])
+    sampler = DDIMSampler(model, schedule, seed=args.seed)
+
+    if args.steps is None:
+        steps_list = [schedule.n_timesteps, 250, 100, 50, 20, 10, 5]
+    else:
+        steps_list = [int(s) for s in args.steps.split(',')]
+    skipped = [n for n in steps_list if n > schedule.n_timesteps]
+    if skipped and args.steps is not None:
+        print(f"Aviso: ignorando {skipped}, o modelo tem apenas {schedule.n_timesteps} passos")
+    steps_list = sorted({n for n in steps_list if n <= schedule.n_timesteps}, reverse=True)
+    if args.tiled:
+        hr_images = load_full_images(args.data_dir, args.num_images, args.scale, seed=args.seed)
+        results = benchmark_tiled(sampler, hr_images, steps_list, scale=args.scale, tile_size=args.tile_size,
+                                  overlap=args.overlap, eta=args.eta, spacing=args.spacing,
+                                  batch_size=args.batch_size)
+    else:
+        hr_images = load_benchmark_images(args.data_dir, args.num_images, args.image_size, seed=args.seed)
+        conditions = degrade(hr_images, args.scale)
+
+        bicubic_psnr = tf.reduce_mean(tf.image.psnr(hr_images, conditions, max_val=1.0)).numpy()
+        print(f"Bicubic PSNR: {bicubic_psnr:.2f} dB ({len(hr_images)} images, {args.image_size}x{args.image_size})")
+        print(TABLE_HEADER)
+
+        results = benchmark(sampler, hr_images, conditions, steps_list,
+                            eta=args.eta, spacing=args.spacing, batch_size=args.batch_size)
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"Resultados salvos em {args.csv}")
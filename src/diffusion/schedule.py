@@ -0,0 +1,145 @@
+import math
+
+import numpy as np
+import tensorflow as tf
+
+
+def make_beta_schedule(schedule='linear', n_timesteps=1000, linear_start=1e-4, linear_end=2e-2, cosine_s=8e-3):
+    """
+    Build the variance schedule beta_1..beta_T of the forward diffusion process.
+
+    Args:
+        schedule: 'linear' (DDPM/SR3) or 'cosine' (improved DDPM)
+        n_timesteps: Number of steps T of the full Markov chain
+        linear_start: First beta of the linear schedule
+        linear_end: Last beta of the linear schedule
+        cosine_s: Offset of the cosine schedule
+
+    Returns:
+        A float64 array with T betas
+    """
+    if schedule == 'linear':
+        betas = np.linspace(linear_start, linear_end, n_timesteps, dtype=np.float64)
+    elif schedule == 'cosine':
+        steps = np.arange(n_timesteps + 1, dtype=np.float64) / n_timesteps
+        alphas_cumprod = np.cos((steps + cosine_s) / (1 + cosine_s) * math.pi / 2) ** 2
+        alphas_cumprod = alphas_cumprod / alphas_cumprod[0]
+        betas = 1 - alphas_cumprod[1:] / alphas_cumprod[:-1]
+        betas = np.clip(betas, 0.0, 0.999)
+    else:
+        raise ValueError(f"Unknown beta schedule: {schedule}")
+
+    return betas
+
+
+def make_sampling_timesteps(n_steps, n_timesteps=1000, spacing='uniform'):
+    """
+    Select the subset of timesteps visited by a strided (DDIM) sampler.
+
+    Args:
+        n_steps: Number of denoising steps to run
+        n_timesteps: Number of steps T the model was trained with
+        spacing: 'uniform' strides evenly over [0, T); 'quad' spends more
+            steps close to t=0, where the fine image detail is generated
+
+    Returns:
+        An int64 array of timesteps in decreasing order, always starting at T-1.
+        With 'quad' spacing near-duplicate steps are merged, so it may be
+        shorter than n_steps.
+    """
+    if not 1 <= n_steps <= n_timesteps:
+        raise ValueError(f"n_steps must be between 1 and {n_timesteps}, got {n_steps}")
+
+    if spacing == 'uniform':
+        timesteps = np.linspace(n_timesteps - 1, 0, n_steps)
+    elif spacing == 'quad':
+        timesteps = np.linspace(np.sqrt(n_timesteps - 1), 0, n_steps) ** 2
+    else:
+        raise ValueError(f"Unknown timestep spacing: {spacing}")
+
+    timesteps = np.unique(np.round(timesteps).astype(np.int64))
+    return timesteps[::-1]
+
+
+class NoiseSchedule:
+    """
+    Precomputed constants of the diffusion forward process.
+
+    The per-timestep constants are computed once in float64 and kept as
+    float32 tensors, and the per-step coefficients of each strided sampling
+    schedule are cached, so sampling never recomputes them inside the loop.
+    """
+
+    def __init__(self, betas):
+        self.betas = np.asarray(betas, dtype=np.float64)
+        self.n_timesteps = len(self.betas)
+        self.alphas_cumprod = np.cumprod(1.0 - self.betas)
+
+        self.sqrt_alphas_cumprod = tf.constant(np.sqrt(self.alphas_cumprod), dtype=tf.float32)
+        self.sqrt_one_minus_alphas_cumprod = tf.constant(np.sqrt(1.0 - self.alphas_cumprod), dtype=tf.float32)
+
+        self._ddim_cache = {}
+
+    @classmethod
+    def from_config(cls, schedule='linear', n_timesteps=1000, **kwargs):
+        """
+        Create a schedule from the arguments of make_beta_schedule.
+        """
+        return cls(make_beta_schedule(schedule, n_timesteps, **kwargs))
+
+    def q_sample(self, x_start, t, noise):
+        """
+        Sample x_t ~ q(x_t | x_0) for a batch of clean images.
+
+        Args:
+            x_start: Clean images in [-1, 1], shape (B, H, W, C)
+            t: Integer timesteps, shape (B,)
+            noise: Standard gaussian noise with the same shape as x_start
+
+        Returns:
+            The noisy images x_t
+        """
+        sqrt_alpha = tf.gather(self.sqrt_alphas_cumprod, t)[:, None, None, None]
+        sqrt_one_minus_alpha = tf.gather(self.sqrt_one_minus_alphas_cumprod, t)[:, None, None, None]
+        return sqrt_alpha * x_start + sqrt_one_minus_alpha * noise
+
+    def ddim_coefficients(self, n_steps, eta=0.0, spacing='uniform'):
+        """
+        Per-step coefficients of the DDIM update for a strided schedule.
+
+        The update for step i is
+            x0 = (x - sqrt_one_minus_alpha[i] * eps) / sqrt_alpha[i]
+            x = sqrt_alpha_prev[i] * x0 + dir_coef[i] * eps + sigma[i] * z
+        eta=0 gives the deterministic DDIM sampler and eta=1 with
+        n_steps=n_timesteps recovers the ancestral DDPM chain.
+
+        Args:
+            n_steps: Number of denoising steps
+            eta: Amount of fresh noise injected at each step, in [0, 1]
+            spacing: Timestep spacing, see make_sampling_timesteps
+
+        Returns:
+            A dict of float32 tensors of shape (n_steps,) plus the int32
+            'timesteps' tensor. Results are cached per (n_steps, eta, spacing).
+        """
+        key = (int(n_steps), float(eta), spacing)
+        if key in self._ddim_cache:
+            return self._ddim_cache[key]
+
+        timesteps = make_sampling_timesteps(n_steps, self.n_timesteps, spacing)
+        alpha = self.alphas_cumprod[timesteps]
+        alpha_prev = np.append(self.alphas_cumprod[timesteps[1:]], 1.0)
+
+        sigma = eta * np.sqrt((1 - alpha_prev) / (1 - alpha) * (1 - alpha / alpha_prev))
+        dir_coef = np.sqrt(np.clip(1 - alpha_prev - sigma ** 2, 0.0, None))
+
+        coefficients = {
+            'timesteps': tf.constant(timesteps, dtype=tf.int32),
+            'sqrt_alpha': tf.constant(np.sqrt(alpha), dtype=tf.float32),
+            'sqrt_one_minus_alpha': tf.constant(np.sqrt(1 - alpha), dtype=tf.float32),
+            'sqrt_alpha_prev': tf.constant(np.sqrt(alpha_prev), dtype=tf.float32),
+            'dir_coef': tf.constant(dir_coef, dtype=tf.float32),
+            'sigma': tf.constant(sigma, dtype=tf.float32),
+        }
+        self._ddim_cache[key] = coefficients
+        return coefficients
@@ -0,0 +1,134 @@
+import argparse
+from pathlib import Path
+
+import tensorflow as tf
+
+from schedule import NoiseSchedule
+from unet import build_sr3_model, save_model_config
+
+
+def prepare_sr_dataset(folder_path, scale=4, patch_size=64, batch_size=4):
+    """
+    Prepare (low resolution, high resolution) pairs for SR3 training.
+
+    Reads the same folder layout produced by the OneDrive pipeline
+    (download_and_process_in_batches writes images/train and images/test).
+    A random high resolution patch is cropped from each image, downscaled by
+    `scale` and upsampled back with bicubic interpolation to build the
+    conditioning input. Images smaller than patch_size are upscaled first,
+    since the OneDrive pipeline does not resize them.
+    """
+    folder_path = Path(folder_path)
+    image_paths = list(folder_path.glob('*.png')) + list(folder_path.glob('*.jpg')) + list(folder_path.glob('*.jpeg'))
+
+    if not image_paths:
+        raise ValueError(f"No images found in {folder_path}")
+
+    print(f"Found {len(image_paths)} images in {folder_path}")
+
+    lr_size = patch_size // scale
+
+    def load_and_preprocess_image(path):
+        # Read and decode image
+        img = tf.io.read_file(path)
+        img = tf.image.decode_image(img, channels=3, expand_animations=False)
+        img = tf.image.convert_image_dtype(img, tf.float32)
+
+        # Upscale images smaller than a patch so the random crop always fits
+        shape = tf.shape(img)[:2]
+        min_side = tf.cast(tf.reduce_min(shape), tf.float32)
+        new_shape = tf.cast(tf.math.ceil(tf.cast(shape, tf.float32) * patch_size / min_side), tf.int32)
+        img = tf.cond(
+            min_side < patch_size,
+            lambda: tf.clip_by_value(tf.image.resize(img, new_shape, method='bicubic'), 0.0, 1.0),
+            lambda: img,
+        )
+
+        # Degrade a high resolution patch to create input-target pairs
+        hr = tf.image.random_crop(img, size=(patch_size, patch_size, 3))
+        lr = tf.image.resize(hr, (lr_size, lr_size), method='bicubic', antialias=True)
+        lr_upsampled = tf.image.resize(lr, (patch_size, patch_size), method='bicubic')
+        lr_upsampled = tf.clip_by_value(lr_upsampled, 0.0, 1.0)
+
+        return lr_upsampled, hr
+
+    # Create dataset
+    dataset = tf.data.Dataset.from_tensor_slices([str(p) for p in image_paths])
+    dataset = dataset.shuffle(len(image_paths))
+    dataset = dataset.map(load_and_preprocess_image, num_parallel_calls=tf.data.AUTOTUNE)
+    dataset = dataset.batch(batch_size)
+    dataset = dataset.prefetch(tf.data.AUTOTUNE)
+
+    return dataset
+
+
+def train_sr3(model, schedule, dataset, epochs=10, learning_rate=1e-4):
+    """
+    Train an SR3 denoiser with the simplified DDPM objective: predict the
+    noise added to the high resolution image at a random timestep.
+    """
+    optimizer = tf.keras.optimizers.Adam(learning_rate=learning_rate)
+    loss_fn = tf.keras.losses.MeanSquaredError()
+
+    @tf.function
+    def train_step(lr_upsampled, hr):
+        x_start = hr * 2.0 - 1.0
+        condition = lr_upsampled * 2.0 - 1.0
+        t = tf.random.uniform([tf.shape(hr)[0]], 0, schedule.n_timesteps, dtype=tf.int32)
+        noise = tf.random.normal(tf.shape(x_start))
+        x_t = schedule.q_sample(x_start, t, noise)
+
+        with tf.GradientTape() as tape:
+            predicted_noise = model((x_t, condition, t), training=True)
+            loss = loss_fn(noise, predicted_noise)
+
+        gradients = tape.gradient(loss, model.trainable_variables)
+        optimizer.apply_gradients(zip(gradients, model.trainable_variables))
+        return loss
+
+    history = {'loss': []}
+    for epoch in range(epochs):
+        epoch_loss = tf.keras.metrics.Mean()
+        for lr_upsampled, hr in dataset:
+            epoch_loss.update_state(train_step(lr_upsampled, hr))
+
+        history['loss'].append(float(epoch_loss.result()))
+        print(f"Epoch {epoch + 1}/{epochs} - loss: {history['loss'][-1]:.4f}")
+
+    return history
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Treinar o denoiser SR3 em imagens locais')
+    parser.add_argument('--data-dir', default='images/train',
+                      help='Pasta com as imagens de treino (gerada por onedrive_dncnn.py)')
+    parser.add_argument('--weights', default='sr3.weights.h5', help='Arquivo para salvar os pesos')
+    parser.add_argument('--scale', type=int, default=4, help='Fator de super resolução')
+    parser.add_argument('--patch-size', type=int, default=64, help='Tamanho dos recortes de alta resolução')
+    parser.add_argument('--batch-size', type=int, default=4)
+    parser.add_argument('--epochs', type=int, default=10)
+    parser.add_argument('--learning-rate', type=float, default=1e-4)
+    parser.add_argument('--timesteps', type=int, default=1000, help='Número de passos T da difusão')
+    parser.add_argument('--base-channels', type=int, default=64)
+    parser.add_argument('--channel-mults', default='1,2,4,8', help='Multiplicadores de canais por nível da U-Net')
+    args = parser.parse_args()
+
+    channel_mults = [int(m) for m in args.channel_mults.split(',')]
+    model = build_sr3_model(
+        image_size=args.patch_size,
+        base_channels=args.base_channels,
+        channel_mults=tuple(channel_mults),
+    )
+    if Path(args.weights).exists():
+        print("Loading existing weights to continue training...")
+        model.load_weights(args.weights)
+
+    schedule = NoiseSchedule.from_config('linear', args.timesteps)
+    dataset = prepare_sr_dataset(args.data_dir, args.scale, args.patch_size, args.batch_size)
+    train_sr3(model, schedule, dataset, epochs=args.epochs, learning_rate=args.learning_rate)
+
+    model.save_weights(args.weights)
+    # The benchmark rebuilds the same architecture and schedule from this file
+    save_model_config(args.weights, base_channels=args.base_channels,
+                      channel_mults=channel_mults, timesteps=args.timesteps)
+    print(f"Pesos salvos em {args.weights}")
@@ -0,0 +1,179 @@
+import json
+import math
+from pathlib import Path
+
+import tensorflow as tf
+from tensorflow.keras import Model, layers
+
+
+def timestep_embedding(t, dim, max_period=10000):
+    """
+    Sinusoidal embedding of integer timesteps, shape (B,) -> (B, dim).
+    """
+    half = dim // 2
+    freqs = tf.exp(-math.log(max_period) * tf.range(half, dtype=tf.float32) / half)
+    args = tf.cast(t, tf.float32)[:, None] * freqs[None, :]
+    return tf.concat([tf.cos(args), tf.sin(args)], axis=-1)
+
+
+class ResBlock(layers.Layer):
+    """
+    Residual block conditioned on the timestep embedding.
+    """
+
+    def __init__(self, in_channels, channels, groups=32, dropout=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.norm1 = layers.GroupNormalization(groups=math.gcd(groups, in_channels))
+        self.conv1 = layers.Conv2D(channels, kernel_size=3, padding='same')
+        self.time_proj = layers.Dense(channels)
+        self.norm2 = layers.GroupNormalization(groups=math.gcd(groups, channels))
+        self.dropout = layers.Dropout(dropout)
+        self.conv2 = layers.Conv2D(channels, kernel_size=3, padding='same')
+        # 1x1 projection only when the residual changes the number of channels
+        self.skip = layers.Conv2D(channels, kernel_size=1) if in_channels != channels else None
+
+    def call(self, x, emb, training=False):
+        h = self.conv1(tf.nn.silu(self.norm1(x)))
+        h = h + self.time_proj(tf.nn.silu(emb))[:, None, None, :]
+        h = self.conv2(self.dropout(tf.nn.silu(self.norm2(h)), training=training))
+        if self.skip is not None:
+            x = self.skip(x)
+        return x + h
+
+
+class Downsample(layers.Layer):
+    def __init__(self, channels, **kwargs):
+        super().__init__(**kwargs)
+        self.conv = layers.Conv2D(channels, kernel_size=3, strides=2, padding='same')
+
+    def call(self, x):
+        return self.conv(x)
+
+
+class Upsample(layers.Layer):
+    def __init__(self, channels, **kwargs):
+        super().__init__(**kwargs)
+        self.upsample = layers.UpSampling2D(size=2, interpolation='nearest')
+        self.conv = layers.Conv2D(channels, kernel_size=3, padding='same')
+
+    def call(self, x):
+        return self.conv(self.upsample(x))
+
+
+class SR3UNet(Model):
+    """
+    Conditional U-Net denoiser used by SR3.
+
+    The network receives the noisy high resolution image x_t concatenated with
+    the bicubic upsampled low resolution image and predicts the noise eps that
+    was added to x_t. Inputs are (x_t, lr_upsampled, t) with images in [-1, 1]
+    and H, W divisible by 2 ** (len(channel_mults) - 1).
+    """
+
+    def __init__(self, out_channels=3, base_channels=64, channel_mults=(1, 2, 4, 8), num_res_blocks=2, dropout=0.0):
+        super().__init__()
+        self.base_channels = base_channels
+        # Input height and width must be multiples of this factor
+        self.downsampling_factor = 2 ** (len(channel_mults) - 1)
+        # GroupNormalization needs a group count that divides the channels
+        groups = math.gcd(32, base_channels)
+        time_dim = base_channels * 4
+
+        self.time_dense1 = layers.Dense(time_dim)
+        self.time_dense2 = layers.Dense(time_dim)
+        self.input_conv = layers.Conv2D(base_channels, kernel_size=3, padding='same')
+
+        # Encoder: every layer output is kept as a skip connection
+        self.down_layers = []
+        skip_channels = [base_channels]
+        ch = base_channels
+        for level, mult in enumerate(channel_mults):
+            for _ in range(num_res_blocks):
+                self.down_layers.append(ResBlock(ch, base_channels * mult, groups, dropout))
+                ch = base_channels * mult
+                skip_channels.append(ch)
+            if level != len(channel_mults) - 1:
+                self.down_layers.append(Downsample(ch))
+                skip_channels.append(ch)
+
+        self.mid_block1 = ResBlock(ch, ch, groups, dropout)
+        self.mid_block2 = ResBlock(ch, ch, groups, dropout)
+
+        # Decoder: every ResBlock consumes one skip connection
+        self.up_layers = []
+        for level, mult in reversed(list(enumerate(channel_mults))):
+            for _ in range(num_res_blocks + 1):
+                in_ch = ch + skip_channels.pop()
+                self.up_layers.append(ResBlock(in_ch, base_channels * mult, groups, dropout))
+                ch = base_channels * mult
+            if level != 0:
+                self.up_layers.append(Upsample(ch))
+
+        self.output_norm = layers.GroupNormalization(groups=groups)
+        # Zero init makes the untrained network predict eps = 0
+        self.output_conv = layers.Conv2D(out_channels, kernel_size=3, padding='same', kernel_initializer='zeros')
+
+    def call(self, inputs, training=False):
+        x_t, condition, t = inputs
+
+        emb = timestep_embedding(t, self.base_channels)
+        emb = self.time_dense2(tf.nn.silu(self.time_dense1(emb)))
+
+        h = self.input_conv(tf.concat([x_t, condition], axis=-1))
+        hs = [h]
+        for layer in self.down_layers:
+            h = layer(h, emb, training=training) if isinstance(layer, ResBlock) else layer(h)
+            hs.append(h)
+
+        h = self.mid_block1(h, emb, training=training)
+        h = self.mid_block2(h, emb, training=training)
+
+        for layer in self.up_layers:
+            if isinstance(layer, ResBlock):
+                h = layer(tf.concat([h, hs.pop()], axis=-1), emb, training=training)
+            else:
+                h = layer(h)
+
+        return self.output_conv(tf.nn.silu(self.output_norm(h)))
+
+
+def build_sr3_model(image_size=64, **kwargs):
+    """
+    Create an SR3UNet and build its weights with a dummy forward pass, so
+    that weights can be loaded right away. Raises ValueError if image_size
+    is not a multiple of the model's downsampling factor.
+    """
+    model = SR3UNet(**kwargs)
+    if image_size % model.downsampling_factor:
+        raise ValueError(f"Image size must be a multiple of {model.downsampling_factor} for this model, got {image_size}")
+    dummy = tf.zeros((1, image_size, image_size, 3))
+    _ = model((dummy, dummy, tf.zeros((1,), dtype=tf.int32)))
+    return model
+
+
+def model_config_path(weights_path):
+    """
+    Path of the JSON file stored next to the weights with the model and
+    schedule configuration, e.g. sr3.weights.h5 -> sr3.weights.h5.json.
+    """
+    return Path(f"{weights_path}.json")
+
+
+def save_model_config(weights_path, **config):
+    """
+    Save the configuration needed to rebuild the model that produced the weights.
+    """
+    with open(model_config_path(weights_path), 'w') as file:
+        json.dump(config, file, indent=2)
+
+
+def load_model_config(weights_path):
+    """
+    Load the configuration saved by save_model_config, or an empty dict if
+    the weights have none.
+    """
+    path = model_config_path(weights_path)
+    if not path.exists():
+        return {}
+    with open(path) as file:
+        return json.load(file)
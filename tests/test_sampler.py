@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from diffusion.sampler import DDIMSampler
+from diffusion.schedule import NoiseSchedule
+from diffusion.unet import build_sr3_model
+
+
+class OracleModel:
+    """
+    Predicts the exact noise of x_t assuming the clean image is the condition.
+    """
+
+    def __init__(self, schedule):
+        self.schedule = schedule
+
+    def __call__(self, inputs, training=False):
+        x_t, condition, t = inputs
+        sqrt_alpha = tf.gather(self.schedule.sqrt_alphas_cumprod, t)[:, None, None, None]
+        sqrt_one_minus_alpha = tf.gather(self.schedule.sqrt_one_minus_alphas_cumprod, t)[:, None, None, None]
+        return (x_t - sqrt_alpha * condition) / sqrt_one_minus_alpha
+
+
+@pytest.fixture(scope="module")
+def tiny_sampler():
+    model = build_sr3_model(image_size=16, base_channels=8, channel_mults=(1, 2), num_res_blocks=1)
+    return DDIMSampler(model, NoiseSchedule.from_config("linear", 50), seed=0)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("eta", [0.0, 1.0])
+def test_sample_with_oracle_model_recovers_clean_images(eta):
+    schedule = NoiseSchedule.from_config("linear", 100)
+    sampler = DDIMSampler(OracleModel(schedule), schedule, seed=0)
+    clean = np.random.default_rng(0).uniform(0.0, 1.0, size=(5, 8, 8, 3)).astype(np.float32)
+
+    sampled = sampler.sample(clean, n_steps=10, eta=eta, batch_size=2)
+
+    np.testing.assert_allclose(sampled, clean, atol=1e-5)
+
+
+@pytest.mark.unit
+def test_super_resolve_output_shapes(tiny_sampler):
+    images = [
+        np.random.rand(11, 7, 3).astype(np.float32),
+        np.random.rand(3, 2, 3).astype(np.float32),
+    ]
+
+    results = tiny_sampler.super_resolve(images, scale=4, tile_size=16, overlap=4, n_steps=2, batch_size=4)
+
+    assert [result.shape for result in results] == [(44, 28, 3), (12, 8, 3)]
+    assert all(np.all((result >= 0.0) & (result <= 1.0)) for result in results)
+
+
+@pytest.mark.unit
+def test_super_resolve_rejects_tile_size_not_divisible_by_model(tiny_sampler):
+    with pytest.raises(ValueError, match="multiple of 2"):
+        tiny_sampler.super_resolve([np.zeros((4, 4, 3), dtype=np.float32)], tile_size=15, overlap=4)
+
+
+@pytest.mark.unit
+def test_super_resolve_empty_list(tiny_sampler):
+    assert tiny_sampler.super_resolve([], tile_size=16, overlap=4) == []
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from diffusion.schedule import NoiseSchedule, make_sampling_timesteps
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("spacing", ["uniform", "quad"])
+@pytest.mark.parametrize("n_steps", [1, 5, 50, 1000])
+def test_sampling_timesteps_descend_from_last_step(n_steps, spacing):
+    timesteps = make_sampling_timesteps(n_steps, 1000, spacing)
+
+    assert timesteps[0] == 999
+    assert np.all(np.diff(timesteps) < 0)
+    assert len(timesteps) <= n_steps
+    if spacing == "uniform":
+        assert len(timesteps) == n_steps
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("n_steps", [0, 1001])
+def test_sampling_timesteps_out_of_bounds(n_steps):
+    with pytest.raises(ValueError):
+        make_sampling_timesteps(n_steps, 1000)
+
+
+@pytest.mark.unit
+def test_ddim_full_chain_sigma_matches_ddpm_posterior_variance():
+    schedule = NoiseSchedule.from_config("linear", 100)
+    coefficients = schedule.ddim_coefficients(100, eta=1.0)
+
+    alphas_cumprod = schedule.alphas_cumprod
+    alphas_cumprod_prev = np.append(1.0, alphas_cumprod[:-1])
+    posterior_variance = schedule.betas * (1 - alphas_cumprod_prev) / (1 - alphas_cumprod)
+
+    timesteps = coefficients["timesteps"].numpy()
+    np.testing.assert_allclose(
+        coefficients["sigma"].numpy() ** 2, posterior_variance[timesteps], rtol=1e-5, atol=1e-12
+    )
+
+
+@pytest.mark.unit
+def test_ddim_coefficients_are_cached():
+    schedule = NoiseSchedule.from_config("linear", 100)
+
+    assert schedule.ddim_coefficients(10) is schedule.ddim_coefficients(10)
+    assert schedule.ddim_coefficients(10) is not schedule.ddim_coefficients(10, eta=1.0)
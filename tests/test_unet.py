@@ -0,0 +1,21 @@
+import pytest
+import tensorflow as tf
+
+from diffusion.unet import build_sr3_model
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("base_channels", [8, 40, 48])
+def test_build_with_base_channels_not_multiple_of_32(base_channels):
+    model = build_sr3_model(image_size=8, base_channels=base_channels, channel_mults=(1, 2), num_res_blocks=1)
+    x = tf.zeros((2, 8, 8, 3))
+
+    eps = model((x, x, tf.zeros((2,), dtype=tf.int32)))
+
+    assert eps.shape == (2, 8, 8, 3)
+
+
+@pytest.mark.unit
+def test_build_rejects_image_size_not_divisible_by_model():
+    with pytest.raises(ValueError, match="multiple of 8"):
+        build_sr3_model(image_size=60, base_channels=8, channel_mults=(1, 2, 4, 8))